@@ -4,12 +4,14 @@
 Contacts Book — Refactored & improved
 Author: refactor by ChatGPT for W4de27's original
 Features:
- - JSON persistent storage (contacts.json in script dir)
+ - JSON persistent storage (contacts.json snapshot + contacts.log journal in script dir)
  - Unicode icons for UI (works in terminals)
  - Optional color output via colorama (auto-fallback)
+ - Optional fast JSON via orjson (auto-fallback to stdlib json)
  - Robust validation, safer save, tidy UX
 """
 
+from functools import lru_cache
 from pathlib import Path
 import json
 import re
@@ -21,8 +23,11 @@ import os
 # ---------- Configuration ----------
 BASE_PATH = Path(__file__).resolve().parent
 JSON_PATH = BASE_PATH / "contacts.json"
+LOG_PATH = BASE_PATH / "contacts.log"
 
 # UI timing (seconds). Keep small so UX is snappy.
+# Delays and dot animations only run when CB_ANIMATE=1 is set.
+ANIMATE = os.environ.get("CB_ANIMATE") == "1"
 _SHORT = 0.6
 _MED = 1.0
 
@@ -38,6 +43,23 @@ except Exception:
     COLOR_OK = COLOR_WARN = COLOR_ERR = COLOR_INFO = ""
     Style = type("S", (), {"RESET_ALL": ""})  # minimal fallback
 
+# ---------- Optional fast JSON ----------
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+def _json_dumps(data) -> bytes:
+    # compact output: no indentation, no spaces after separators
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 # ---------- Icons ----------
 ICON_ADD = "➕"
 ICON_SEARCH = "🔎"
@@ -55,39 +77,178 @@ ICON_USER = "👤"
 ICON_WARN = "🚨"
 
 # ---------- Validators ----------
-PHONE_RE = re.compile(r'^\d{10}$')  # keep 10-digit rule as original
 EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
 
 def is_valid_phone(p: str) -> bool:
-    return bool(PHONE_RE.match(p))
+    # keep 10-digit rule as original (ASCII digits only)
+    return len(p) == 10 and p.isascii() and p.isdigit()
 
+@lru_cache(maxsize=1024)
 def is_valid_email(e: str) -> bool:
     return bool(EMAIL_RE.match(e) or e == "")
 
 # ---------- IO helpers ----------
-def safe_load_contacts() -> dict:
+# contacts.json is a full snapshot; every change since then is appended to
+# contacts.log as one JSON op per line ({"op": "set"|"del", "phone": ...}).
+# compact() folds the log back into the snapshot.
+def _load_snapshot() -> dict:
     if not JSON_PATH.exists():
         return {}
     try:
-        with JSON_PATH.open("r", encoding="utf-8") as f:
-            data = json.load(f) or {}
-            if isinstance(data, dict):
-                return data
-    except (json.JSONDecodeError, IOError):
+        data = _json_loads(JSON_PATH.read_bytes()) or {}
+        if isinstance(data, dict):
+            return data
+    except (ValueError, IOError):
         pass
     return {}
 
-def safe_save_contacts(data: dict) -> None:
+def _apply_op(data: dict, op: dict) -> None:
+    if op["op"] == "set":
+        if isinstance(op["rec"], dict):
+            data[op["phone"]] = op["rec"]
+    elif op["op"] == "del":
+        data.pop(op["phone"], None)
+
+def safe_load_contacts() -> dict:
+    data = _load_snapshot()
+    try:
+        with LOG_PATH.open("rb") as log:
+            for line in log:
+                try:
+                    _apply_op(data, _json_loads(line))
+                except (ValueError, KeyError, TypeError):
+                    pass  # skip a torn or garbled line
+    except IOError:
+        pass
+    # normalize once so every record carries string name, email and name_lower;
+    # records that aren't objects at all are dropped rather than crash the app
+    data = {p: v for p, v in data.items() if isinstance(v, dict)}
+    for v in data.values():
+        v["name"] = str(v.get("name") or "N/A")
+        v["email"] = str(v.get("email") or "")
+        v["name_lower"] = v["name"].lower()  # derived; never trust the stored copy
+    return data
+
+def _on_disk(rec: dict) -> dict:
+    # name_lower is derived on load, so it is never persisted
+    return {k: v for k, v in rec.items() if k != "name_lower"}
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+def safe_save_contacts(data: dict) -> bool:
     # atomic write to avoid corruption
     try:
         tmp_fd, tmp_path = tempfile.mkstemp(dir=str(BASE_PATH))
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as tmp:
-            json.dump(data, tmp, ensure_ascii=False, indent=4)
-        Path(tmp_path).replace(JSON_PATH)
+        try:
+            # buffered writer retries short writes until all bytes are out
+            with os.fdopen(tmp_fd, "wb") as tmp:
+                tmp.write(_json_dumps({p: _on_disk(v) for p, v in data.items()}))
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            Path(tmp_path).replace(JSON_PATH)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        _remember_key()
+        return True
     except Exception as e:
         print(f"\n{COLOR_ERR}{ICON_FAIL} ERROR saving contacts: {e}{Style.RESET_ALL}")
-        time.sleep(_MED)
+        ui_sleep(_MED)
         pause()
+        return False
+
+def compact() -> None:
+    # rewrite the snapshot from memory, then drop the now-redundant log.
+    # set/del ops are idempotent, so a crash between the two steps is harmless.
+    if safe_save_contacts(get_contacts()):
+        try:
+            LOG_PATH.unlink()
+        except FileNotFoundError:
+            pass
+        _remember_key()
+
+def append_op(*ops: dict) -> None:
+    # ops are written in order; a crash can still tear the last line, which
+    # replay skips, so callers order multi-op changes to fail safe
+    try:
+        payload = b"".join(
+            _json_dumps(dict(op, rec=_on_disk(op["rec"])) if "rec" in op else op) + b"\n"
+            for op in ops)
+        # buffered, so short writes are retried until every byte is out
+        with LOG_PATH.open("a+b") as log:
+            end = log.seek(0, os.SEEK_END)
+            if end:
+                log.seek(end - 1)
+                if log.read(1) != b"\n":
+                    # a crash left a torn last line; don't glue onto it
+                    payload = b"\n" + payload
+            log.write(payload)
+            log.flush()
+        _remember_key()
+    except Exception as e:
+        print(f"\n{COLOR_ERR}{ICON_FAIL} ERROR saving contacts: {e}{Style.RESET_ALL}")
+        ui_sleep(_MED)
+        pause()
+        return
+    if _file_size(LOG_PATH) > 2 * _file_size(JSON_PATH):
+        compact()
+
+# ---------- In-memory store ----------
+# Contacts are loaded once and kept in memory; the files are only re-read
+# when their (mtime_ns, size) stamps differ from our last load/save.
+_CONTACTS = None
+_CONTACTS_KEY = None
+
+# Secondary indexes: lowercased name / email -> phone keys, kept in a dict
+# (used as an ordered set) so matches list in insertion order.
+_NAME_IDX = {}
+_EMAIL_IDX = {}
+
+def _index_add(phone: str, info: dict) -> None:
+    _NAME_IDX.setdefault(info["name_lower"], {})[phone] = None
+    _EMAIL_IDX.setdefault(info["email"].lower(), {})[phone] = None
+
+def _index_remove(phone: str, info: dict) -> None:
+    for idx, key in ((_NAME_IDX, info["name_lower"]),
+                     (_EMAIL_IDX, info["email"].lower())):
+        phones = idx.get(key)
+        if phones is not None:
+            phones.pop(phone, None)
+            if not phones:
+                del idx[key]
+
+def _rebuild_indexes(contacts: dict) -> None:
+    _NAME_IDX.clear()
+    _EMAIL_IDX.clear()
+    for phone, info in contacts.items():
+        _index_add(phone, info)
+
+def _storage_key():
+    stamps = []
+    for path in (JSON_PATH, LOG_PATH):
+        try:
+            st = path.stat()
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+def _remember_key() -> None:
+    global _CONTACTS_KEY
+    _CONTACTS_KEY = _storage_key()
+
+def get_contacts() -> dict:
+    global _CONTACTS, _CONTACTS_KEY
+    key = _storage_key()
+    if _CONTACTS is None or key != _CONTACTS_KEY:
+        _CONTACTS = safe_load_contacts()
+        _CONTACTS_KEY = key
+        _rebuild_indexes(_CONTACTS)
+    return _CONTACTS
 
 # ---------- Small UI helpers ----------
 
@@ -108,7 +269,13 @@ def print_warn(text: str):
 def print_err(text: str):
     print(f"{COLOR_ERR}{ICON_FAIL} {text}{Style.RESET_ALL}")
 
+def ui_sleep(seconds: float):
+    if ANIMATE:
+        time.sleep(seconds)
+
 def anim_dots(word="Processing", repeats=3, delay=0.4):
+    if not ANIMATE:
+        return
     for i in range(repeats):
         dots = "." * ((i % 3) + 1)
         print(f"\r{word}{dots}   ", end="", flush=True)
@@ -120,7 +287,7 @@ def anim_dots(word="Processing", repeats=3, delay=0.4):
 
 # ---------- Core actions ----------
 def add_contact():
-    contacts = safe_load_contacts()
+    contacts = get_contacts()
     print()
     print(f"{ICON_ADD}  Add New Contact")
     print("-" * 36)
@@ -156,45 +323,50 @@ def add_contact():
         return
 
     anim_dots("Saving", 2)
-    contacts[phone] = {"name": name.strip().title(), "email": email}
-    safe_save_contacts(contacts)
+    title = name.title()
+    contacts[phone] = {"name": title, "email": email, "name_lower": title.lower()}
+    _index_add(phone, contacts[phone])
+    append_op({"op": "set", "phone": phone, "rec": contacts[phone]})
     print_ok("Contact added successfully!")
-    time.sleep(_SHORT)
+    ui_sleep(_SHORT)
     pause()
 
-def _print_contact_block(index, phone, info):
-    print("=" * 36)
-    print(f"[{index}] {ICON_USER} {info.get('name','N/A')}")
-    print(f"    {ICON_PHONE} Phone: {phone}")
-    email = info.get("email") or "—"
-    print(f"    {ICON_EMAIL}  Email: {email}")
-    print("-" * 36)
+def _format_contact_block(index, phone, info) -> str:
+    email = info["email"] or "—"
+    return (
+        f"{'=' * 36}\n"
+        f"[{index}] {ICON_USER} {info['name']}\n"
+        f"    {ICON_PHONE} Phone: {phone}\n"
+        f"    {ICON_EMAIL}  Email: {email}\n"
+        f"{'-' * 36}\n"
+    )
 
 def list_contacts():
-    contacts = safe_load_contacts()
+    contacts = get_contacts()
     print(f"{ICON_LIST}  Contact List")
     print("-" * 36)
     if not contacts:
         print_warn("No contacts found. Add your first contact!")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
     # sort by name for friendly listing
-    items = sorted(contacts.items(), key=lambda kv: kv[1].get("name","").lower())
-    for i, (phone, info) in enumerate(items, start=1):
-        _print_contact_block(i, phone, info)
-        time.sleep(0.5)
+    items = sorted(contacts.items(), key=lambda kv: kv[1]["name_lower"])
+    # build the whole listing and emit it with a single write
+    parts = [_format_contact_block(i, phone, info)
+             for i, (phone, info) in enumerate(items, start=1)]
+    sys.stdout.write("".join(parts))
     print_ok(f" End of list — Total: {len(items)}")
     pause()
 
 def search_contact():
-    contacts = safe_load_contacts()
+    contacts = get_contacts()
     print()
     print(f"{ICON_SEARCH}  Search Contacts")
     print("-" * 36)
     if not contacts:
         print_warn("No contacts to search.")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
     print("1) By Phone")
@@ -221,7 +393,7 @@ def search_contact():
             print_err("Invalid phone!")
             pause()
             return
-        res = [(p,v) for p,v in contacts.items() if p == q]
+        res = [(q, contacts[q])] if q in contacts else []
 
     elif choice == "2":
         q = input("Enter name: ").strip().lower()
@@ -230,37 +402,36 @@ def search_contact():
             print_err("Name required!")
             pause()
             return
-        res = [(p,v) for p,v in contacts.items() if v.get("name","").lower() == q]
+        res = [(p, contacts[p]) for p in _NAME_IDX.get(q, ())]
 
     else:  # email
         q = input("Enter email: ").strip().lower()
-        if not is_valid_email(q) or not q == "":
+        if not q or not is_valid_email(q):
             anim_dots("Checking")
             print_err("Invalid email!")
             pause()
             return
-        res = [(p,v) for p,v in contacts.items() if (v.get("email") or "").lower() == q]
+        res = [(p, contacts[p]) for p in _EMAIL_IDX.get(q, ())]
 
     if not res:
         print_err("No contact found.")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
 
     print()
-    for i, (phone, info) in enumerate(res, start=1):
-        _print_contact_block(i, phone, info)
-        time.sleep(0.6)
+    sys.stdout.write("".join(_format_contact_block(i, phone, info)
+                             for i, (phone, info) in enumerate(res, start=1)))
     pause()
 
 def delete_contact():
-    contacts = safe_load_contacts()
+    contacts = get_contacts()
     print()
     print(f"{ICON_DELETE}  Delete Contact")
     print("-" * 36)
     if not contacts:
         print_warn("No contacts to delete.")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
     print("1) By Phone")
@@ -287,7 +458,7 @@ def delete_contact():
             print_err("Invalid phone!")
             pause()
             return
-        matches = {p:v for p,v in contacts.items() if p == q}
+        matches = {q: contacts[q]} if q in contacts else {}
 
     elif choice == "2":
         q = input("Name: ").strip().lower()
@@ -296,20 +467,20 @@ def delete_contact():
             print_err("Name required!")
             pause()
             return
-        matches = {p:v for p,v in contacts.items() if v.get("name","").lower() == q}
+        matches = {p: contacts[p] for p in _NAME_IDX.get(q, ())}
 
     else:
         q = input("Email: ").strip().lower()
-        if not is_valid_email(q) or not q == "":
+        if not q or not is_valid_email(q):
             anim_dots("Checking")
             print_err("Invalid email!")
             pause()
             return
-        matches = {p:v for p,v in contacts.items() if (v.get("email") or "").lower() == q}
+        matches = {p: contacts[p] for p in _EMAIL_IDX.get(q, ())}
 
     if not matches:
         print_err("No matching contact found.")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
 
@@ -318,7 +489,7 @@ def delete_contact():
     items = list(matches.items())
     print("=" * 40)
     for i, (phone, info) in enumerate(items, start=1):
-        print(f"[{i}] {info.get('name')} — {phone}")
+        print(f"[{i}] {info['name']} — {phone}")
     print("=" * 40)
     
     print()
@@ -329,32 +500,33 @@ def delete_contact():
             print_warn("Delete cancelled.")
             pause()
             return
-        contacts.pop(items[0][0], None)
+        phone_sel = items[0][0]
     else:
         try:
-            sel = int(input(f"Select contact number to delete (1-{len(items)}): ").strip())
+            sel = int(input(f"Select contact number to delete (1-{len(items)}): "))
             if not (1 <= sel <= len(items)):
                 print_err("Invalid selection!")
                 pause()
                 return
-            contacts.pop(items[sel-1][0], None)
+            phone_sel = items[sel-1][0]
         except ValueError:
             print_err("Please enter a valid number!")
             pause()
             return
-    safe_save_contacts(contacts)
+    _index_remove(phone_sel, contacts.pop(phone_sel))
+    append_op({"op": "del", "phone": phone_sel})
     print_ok("Contact deleted.")
-    time.sleep(_SHORT)
+    ui_sleep(_SHORT)
     pause()
 
 def update_contact():
-    contacts = safe_load_contacts()
+    contacts = get_contacts()
     print()
     print(f"{ICON_UPDATE}  Update Contact")
     print("-" * 36)
     if not contacts:
         print_warn("No contacts to update.")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
     # Find contact first
@@ -384,7 +556,7 @@ def update_contact():
             print_err("Invalid phone!")
             pause()
             return
-        matches = {p:v for p,v in contacts.items() if p == q}
+        matches = {q: contacts[q]} if q in contacts else {}
     elif ch == "2":
         q = input("Name: ").strip().lower()
         if not q:
@@ -392,19 +564,19 @@ def update_contact():
             print_err("Name required!")
             pause()
             return
-        matches = {p:v for p,v in contacts.items() if v.get("name","").lower() == q}
+        matches = {p: contacts[p] for p in _NAME_IDX.get(q, ())}
     else:
         q = input("Email: ").strip().lower()
-        if not is_valid_email(q) or not q == "":
+        if not q or not is_valid_email(q):
             anim_dots("Checking")
             print_err("Invalid email!")
             pause()
             return
-        matches = {p:v for p,v in contacts.items() if (v.get("email") or "").lower() == q}
+        matches = {p: contacts[p] for p in _EMAIL_IDX.get(q, ())}
 
     if not matches:
         print_err("No contact found.")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
 
@@ -415,11 +587,11 @@ def update_contact():
     else:
         print("=" * 40)
         for i, (phone, info) in enumerate(items, start=1):
-            print(f"[{i}] {info.get('name')} — {phone}")
+            print(f"[{i}] {info['name']} — {phone}")
         print("=" * 40)
         print()
         try:
-            sel = int(input(f"Select contact number to update (1-{len(items)}): ").strip())
+            sel = int(input(f"Select contact number to update (1-{len(items)}): "))
             if not (1 <= sel <= len(items)):
                 print_err("Invalid selection!")
                 pause()
@@ -462,7 +634,13 @@ def update_contact():
             print_err("Phone already exists!")
             pause()
             return
-        contacts[new_phone] = contacts.pop(phone_sel)
+        info = contacts.pop(phone_sel)
+        _index_remove(phone_sel, info)
+        contacts[new_phone] = info
+        _index_add(new_phone, info)
+        # set before del: a torn write leaves a duplicate, never a lost record
+        append_op({"op": "set", "phone": new_phone, "rec": info},
+                  {"op": "del", "phone": phone_sel})
     elif fld == "2":
         new_name = input("New name: ").strip()
         if not new_name:
@@ -470,7 +648,12 @@ def update_contact():
             print_err("Name required!")
             pause()
             return
-        contacts[phone_sel]["name"] = new_name.title()
+        info = contacts[phone_sel]
+        _index_remove(phone_sel, info)
+        info["name"] = new_name.title()
+        info["name_lower"] = info["name"].lower()
+        _index_add(phone_sel, info)
+        append_op({"op": "set", "phone": phone_sel, "rec": info})
     else:
         new_email = input("New email (leave blank to clear): ").strip()
         if new_email and not is_valid_email(new_email):
@@ -478,20 +661,23 @@ def update_contact():
             print_err("Invalid email!")
             pause()
             return
-        contacts[phone_sel]["email"] = new_email
+        info = contacts[phone_sel]
+        _index_remove(phone_sel, info)
+        info["email"] = new_email
+        _index_add(phone_sel, info)
+        append_op({"op": "set", "phone": phone_sel, "rec": info})
 
-    safe_save_contacts(contacts)
     print_ok(" Contact updated.")
-    time.sleep(_SHORT)
+    ui_sleep(_SHORT)
     pause()
 
 def clear_all_contacts():
-    contacts = safe_load_contacts()
+    contacts = get_contacts()
     print(f"{ICON_CLEAR}  Clear All Contacts")
     print("-" * 36)
     if not contacts:
         print_warn("No contacts to clear.")
-        time.sleep(_SHORT)
+        ui_sleep(_SHORT)
         pause()
         return
     print_warn("WARNING: This will permanently delete ALL contacts!")
@@ -500,19 +686,30 @@ def clear_all_contacts():
     if confirm != "confirm":
         print_warn("Clear cancelled.")
         return
-    safe_save_contacts({})
+    contacts.clear()
+    _rebuild_indexes(contacts)
+    compact()
     print_ok("All contacts removed.")
-    time.sleep(_SHORT)
+    ui_sleep(_SHORT)
     pause()
 
 # ---------- Main menu ----------
+_ACTIONS = {
+    "1": add_contact,
+    "2": search_contact,
+    "3": delete_contact,
+    "4": update_contact,
+    "5": list_contacts,
+    "6": clear_all_contacts,
+}
+
 def main():
     # small start banner
     print()
     print("=" * 48)
     print(f"{'CONTACTS BOOK — Simple CLI':^48}")
     print("=" * 48)
-    time.sleep(0.4)
+    ui_sleep(0.4)
 
     while True:
         print()
@@ -527,31 +724,25 @@ def main():
         print(f"7. {ICON_EXIT}  Exit")
         print("-----------------------------")
         choice = input("Enter a valid choice (1-7): ").strip()
-        if choice == "1":
-            add_contact()
-        elif choice == "2":
-            search_contact()
-        elif choice == "3":
-            delete_contact()
-        elif choice == "4":
-            update_contact()
-        elif choice == "5":
-            list_contacts()
-        elif choice == "6":
-            clear_all_contacts()
+        action = _ACTIONS.get(choice)
+        if action:
+            action()
         elif choice == "7":
             print("\n" + "=" * 45)
             print_ok(" Thank you for using Contacts Book — Bye!")
             print("=" * 45)
-            time.sleep(0.6)
+            ui_sleep(0.6)
             sys.exit(0)
         else:
             anim_dots("Checking")
             print_err("Invalid choice — try again.")
-            time.sleep(0.6)
+            ui_sleep(0.6)
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
         print("\n\nProgram closed by user. Goodbye!\n")
+    finally:
+        if LOG_PATH.exists():
+            compact()